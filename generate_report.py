@@ -1,212 +1,273 @@
+import array
 import json
+import mmap
 import sys
 import re
 import os
+import stat
 import numpy as np
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from statistics import fmean
 
-def generate_report(results_files):
-    """
-    Reads multiple streaming k6 JSON files, aggregates metrics for each module,
-    and generates a single, comprehensive HTML report.
+# Prefer orjson for parsing the k6 data points; fall back to the stdlib parser when it is not installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-    Args:
-        results_files (list): A list of paths to the k6 JSON output files.
-    """
-    
-    # Check if the list of files is empty.
-    if not results_files:
-        print("Error: No result files were provided.")
-        sys.exit(1)
+# Patterns for the k6 threshold expressions checked in the report, compiled once at import.
+_P95_RE = re.compile(r'p\(95\)<(\d+)')
+_RATE_RE = re.compile(r'rate<([\d.]+)')
 
-    # Dictionary to hold the aggregated metrics for all modules
-    all_modules_metrics = {}
+# Metrics whose k6 thresholds are checked in the report's Thresholds Summary.
+_THRESHOLD_METRICS = frozenset({'http_req_duration', 'http_req_failed'})
 
-    # Global counters for overall summary
-    global_total_requests = 0
-    global_failed_requests = 0
-    global_total_durations = []
-    global_max_vus = 0
-    global_data_sent = 0
-    global_data_received = 0
-    global_thresholds = {}
-    
-    # Flag to track if any module fails the p95 threshold check
-    p95_duration_threshold_passed = True
+# Prefix stripped from result file names when labelling each module in the report.
+_RESULTS_FILE_PREFIX = 'k6_results_'
 
-    for results_file in results_files:
-        if not os.path.exists(results_file):
-            print(f"Error: The file '{results_file}' was not found. Skipping this file.")
-            continue
+# Below this many samples, statistics.fmean beats np.mean's call overhead (measured crossover ~200-250 samples).
+_NUMPY_MEAN_MIN_SAMPLES = 256
 
-        print(f"Processing results from '{results_file}'...")
+# Decoder used to walk buffers holding several, or partial, JSON objects.
+_JSON_DECODER = json.JSONDecoder()
+# Characters JSON allows between values, skipped between concatenated objects.
+_JSON_WHITESPACE = ' \t\n\r'
 
-        # Initialize a data structure for the current module's metrics
-        module_metrics = {
-            'http_reqs': 0,
-            'http_req_failed': 0,
-            'http_req_durations': [],
-            'group_durations': defaultdict(lambda: {'values': [], 'final_avg': 0}),
-            'group_failures': defaultdict(int),
-            'max_vus': 0,
-            'data_sent': 0,
-            'data_received': 0
-        }
+def _decode_buffered(first_line, lines):
+    """
+    Decodes JSON objects starting at a line the fast per-line parse rejected.
 
+    The line may hold several back-to-back objects ('{...}{...}') or only the start of an
+    object that spans several lines (e.g. pretty-printed output). Following lines are
+    appended to the buffer until every object in it has been decoded with raw_decode.
+    """
+    buffer = first_line.decode('utf-8') if isinstance(first_line, bytes) else first_line
+    idx = 0
+    while True:
+        while idx < len(buffer) and buffer[idx] in _JSON_WHITESPACE:
+            idx += 1
+        if idx == len(buffer):
+            return
         try:
-            with open(results_file, 'r') as f:
-                file_content = f.read()
-                
-                # Use regex to wrap the series of JSON objects in a valid JSON array format.
-                json_objects_str = '[' + re.sub(r'}\s*{', '},{', file_content.strip()) + ']'
-                
-                # Parse the entire file content as a single JSON array.
-                data_points = json.loads(json_objects_str)
-
-        except IOError as e:
-            print(f"Error reading the file '{results_file}': {e}")
-            continue
+            obj, idx = _JSON_DECODER.raw_decode(buffer, idx)
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from '{results_file}'. The file may be malformed. Error: {e}")
+            # Only an object cut off at the end of the buffer can be completed by the next line.
+            if buffer[e.pos:].strip(_JSON_WHITESPACE):
+                raise
+            next_line = next(lines, None)
+            if next_line is None:
+                raise
+            if isinstance(next_line, bytes):
+                next_line = next_line.decode('utf-8')
+            buffer = buffer[idx:] + next_line
+            idx = 0
             continue
-        
-        # --- AGGREGATE RAW DATA FROM EACH DATA POINT FOR THE CURRENT MODULE ---
-        for data_point in data_points:
-            metric_name = data_point.get('metric')
-            data = data_point.get('data', {})
+        yield obj
+
+def _iter_data_points(lines):
+    """
+    Yields the data points of a k6 JSON output stream, one line at a time.
+
+    k6 writes one object per line; a line holding several concatenated objects, or an
+    object spread over several lines, is handed to the raw decoder instead of rewriting
+    the text into an array.
+    """
+    loads = _json_loads
+    lines = iter(lines)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data_point = loads(line)
+        except json.JSONDecodeError:
+            yield from _decode_buffered(line, lines)
+            continue
+        yield data_point
+
+def _iter_file_data_points(results_file):
+    """
+    Yields the data points of a k6 JSON output file, reading regular files through a read-only memory map.
+
+    Lines are handed to the parser as raw bytes, so the file is never decoded into one large string.
+    Pipes and other non-regular files (e.g. /dev/stdin, FIFOs) cannot be mapped and are read as a stream.
+    """
+    with open(results_file, 'rb') as f:
+        file_stat = os.fstat(f.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            yield from _iter_data_points(f)
+            return
+        # An empty regular file has no data points, and mmap cannot map zero bytes.
+        if file_stat.st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _iter_data_points(iter(mm.readline, b''))
+
+def _p95(values):
+    """
+    Returns the 95th percentile of a float64 array, matching np.percentile's default linear interpolation.
+
+    Only the two neighbouring order statistics are selected with np.partition, so no full sort is needed.
+    """
+    if values.size == 0:
+        return 0.0
+    rank = 0.95 * (values.size - 1)
+    lo = int(rank)
+    hi = min(lo + 1, values.size - 1)
+    partitioned = np.partition(values, (lo, hi))
+    return float(partitioned[lo] + (partitioned[hi] - partitioned[lo]) * (rank - lo))
+
+# --- PER-METRIC HANDLERS FOR k6 'Point' DATA ---
+# Each handler folds a single data point's 'data' payload into the current module's metrics.
+
+def _h_reqs(data, module_metrics):
+    if data.get('value') == 1:
+        module_metrics['http_reqs'] += 1
+
+def _h_failed(data, module_metrics):
+    if data.get('value') == 1:
+        module_metrics['http_req_failed'] += 1
+        if 'tags' in data and 'group' in data['tags']:
+            group_name = data['tags']['group']
+            module_metrics['group_failures'][group_name] += 1
+
+def _h_dur(data, module_metrics):
+    if 'value' in data:
+        module_metrics['http_req_durations'].append(data['value'])
+
+def _h_group(data, module_metrics):
+    if 'tags' in data and 'value' in data:
+        group_name = data['tags']['group']
+        group_values = module_metrics['group_values']
+        values = group_values.get(group_name)
+        if values is None:
+            values = group_values[group_name] = array.array('d')
+        values.append(data['value'])
+
+def _h_vus(data, module_metrics):
+    if 'value' in data:
+        module_metrics['vus_values'].append(data['value'])
+
+def _h_sent(data, module_metrics):
+    if 'value' in data:
+        module_metrics['data_sent_values'].append(data['value'])
+
+def _h_recv(data, module_metrics):
+    if 'value' in data:
+        module_metrics['data_received_values'].append(data['value'])
+
+# Dispatch table keyed by k6 metric name; metrics not listed here are ignored.
+_POINT_HANDLERS = {
+    'http_reqs': _h_reqs,
+    'http_req_failed': _h_failed,
+    'http_req_duration': _h_dur,
+    'group_duration': _h_group,
+    'vus': _h_vus,
+    'data_sent': _h_sent,
+    'data_received': _h_recv,
+}
+
+def _process_one(results_file):
+    """
+    Parses a single streaming k6 JSON file and aggregates its metrics.
+
+    Args:
+        results_file (str): Path to the k6 JSON output file.
+
+    Returns:
+        tuple: (module_name, module_metrics, file_thresholds), or None if the file could not be read or parsed.
+    """
+    print(f"Processing results from '{results_file}'...")
+
+    # Initialize a data structure for the current module's metrics
+    module_metrics = {
+        'http_reqs': 0,
+        'http_req_failed': 0,
+        # Durations are kept in contiguous double buffers so numpy can read them without copying.
+        'http_req_durations': array.array('d'),
+        'group_values': {},
+        'group_avgs': {},
+        'group_failures': defaultdict(int),
+        # Raw gauge/counter samples, reduced to the totals below once the file is parsed.
+        'vus_values': array.array('d'),
+        'data_sent_values': array.array('d'),
+        'data_received_values': array.array('d'),
+        'max_vus': 0,
+        'data_sent': 0,
+        'data_received': 0,
+        'p95': 0.0
+    }
+
+    # Thresholds are only returned once the whole file has parsed cleanly.
+    file_thresholds = {}
+    pending_thresholds = set(_THRESHOLD_METRICS)
+
+    # Bind the handler lookup to a local so the hot loop avoids a global lookup.
+    get_handler = _POINT_HANDLERS.get
+
+    try:
+        # k6 writes one JSON object per line, so stream the file and aggregate each
+        # data point as it is read instead of loading the whole file into memory.
+        for data_point in _iter_file_data_points(results_file):
+            # --- AGGREGATE RAW DATA FROM EACH DATA POINT FOR THE CURRENT MODULE ---
             data_type = data_point.get('type')
 
+            # k6 always emits 'metric' and 'data' on a Point, so index them directly on the hot path
+            # and skip only the rare point that lacks one of them.
             if data_type == 'Point':
-                if metric_name == 'http_reqs' and data.get('value') == 1:
-                    module_metrics['http_reqs'] += 1
-                
-                elif metric_name == 'http_req_failed' and data.get('value') == 1:
-                    module_metrics['http_req_failed'] += 1
-                    if 'tags' in data and 'group' in data['tags']:
-                        group_name = data['tags']['group']
-                        module_metrics['group_failures'][group_name] += 1
-                
-                elif metric_name == 'http_req_duration' and 'value' in data:
-                    module_metrics['http_req_durations'].append(data['value'])
-                
-                elif metric_name == 'group_duration' and 'tags' in data and 'value' in data:
-                    group_name = data['tags']['group']
-                    module_metrics['group_durations'][group_name]['values'].append(data['value'])
-                
-                elif metric_name == 'vus' and 'value' in data:
-                    module_metrics['max_vus'] = max(module_metrics['max_vus'], data['value'])
-                
-                elif metric_name == 'data_sent' and 'value' in data:
-                    module_metrics['data_sent'] += data['value']
-                
-                elif metric_name == 'data_received' and 'value' in data:
-                    module_metrics['data_received'] += data['value']
-
-            elif data_type == 'Metric' and 'thresholds' in data:
-                global_thresholds[metric_name] = data['thresholds']
-
-        # Calculate final average duration for each group in this module
-        for group_name, group_data in module_metrics['group_durations'].items():
-            if group_data['values']:
-                group_data['final_avg'] = np.mean(group_data['values'])
-        
-        # Add the module's metrics to the main dictionary
-        module_name = os.path.splitext(os.path.basename(results_file))[0].replace('k6_results_', '').replace('_', ' ').title()
-        all_modules_metrics[module_name] = module_metrics
+                try:
+                    metric_name = data_point['metric']
+                    data = data_point['data']
+                except KeyError:
+                    continue
+                handler = get_handler(metric_name)
+                if handler is not None:
+                    handler(data, module_metrics)
 
-        # Update global totals for the summary section
-        global_total_requests += module_metrics['http_reqs']
-        global_failed_requests += module_metrics['http_req_failed']
-        global_total_durations.extend(module_metrics['http_req_durations'])
-        global_max_vus = max(global_max_vus, module_metrics['max_vus'])
-        global_data_sent += module_metrics['data_sent']
-        global_data_received += module_metrics['data_received']
+            # Metric envelopes are only inspected until every threshold the report uses has been seen.
+            elif data_type == 'Metric' and pending_thresholds:
+                metric_name = data_point.get('metric')
+                if metric_name in pending_thresholds:
+                    data = data_point.get('data', {})
+                    if 'thresholds' in data:
+                        file_thresholds[metric_name] = data['thresholds']
+                        pending_thresholds.discard(metric_name)
 
-    # --- CALCULATE GLOBAL SUMMARY STATISTICS ---
-    global_passed_requests = global_total_requests - global_failed_requests
-    data_sent_mb = global_data_sent / (1024 * 1024)
-    data_received_mb = global_data_received / (1024 * 1024)
+    except IOError as e:
+        print(f"Error reading the file '{results_file}': {e}")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"Error decoding JSON from '{results_file}'. The file may be malformed. Error: {e}")
+        return None
 
-    if global_total_durations:
-        avg_response_time = np.mean(global_total_durations)
-        global_p95_response_time = np.percentile(global_total_durations, 95)
-    else:
-        avg_response_time = 0
-        global_p95_response_time = 0
-    
-    # --- CHECK THRESHOLDS AND GENERATE DYNAMIC LABELS ---
-    http_failure_rate_passed = False
-    http_failure_label = "HTTP Failure Rate (No threshold defined)"
-    p95_duration_label = "95th Percentile Duration (No threshold defined)"
-    p95_threshold_value = None
+    # Calculate final average duration for each group in this module
+    module_metrics['group_avgs'] = {
+        group_name: fmean(values) if len(values) < _NUMPY_MEAN_MIN_SAMPLES else np.mean(np.frombuffer(values, dtype=np.float64))
+        for group_name, values in module_metrics['group_values'].items()
+    }
 
-    # Find the p95 threshold value
-    if 'http_req_duration' in global_thresholds:
-        for threshold_str in global_thresholds['http_req_duration']:
-            match = re.search(r'p\(95\)<(\d+)', threshold_str)
-            if match:
-                p95_threshold_value = float(match.group(1))
-                p95_duration_label = f"95th Percentile Duration (Goal: < {p95_threshold_value}ms)"
-                break
-    
-    # Check the p95 duration threshold against each module's results
-    if p95_threshold_value is not None:
-        # Loop through each module's metrics and check its p95
-        for module_name, metrics in all_modules_metrics.items():
-            if metrics['http_req_durations']:
-                module_p95 = np.percentile(metrics['http_req_durations'], 95)
-                if module_p95 > p95_threshold_value:
-                    p95_duration_threshold_passed = False
-                    break # A single failure is enough to fail the overall check
-            else:
-                p95_duration_threshold_passed = False # No requests means a failure in some sense
-    else:
-        p95_duration_threshold_passed = True # No threshold defined, so it technically "passes"
+    # Reduce the raw vus and data samples to their totals in one vectorized pass each
+    vus_values = module_metrics.pop('vus_values')
+    module_metrics['max_vus'] = int(np.frombuffer(vus_values, dtype=np.float64).max()) if vus_values else 0
+    module_metrics['data_sent'] = float(np.frombuffer(module_metrics.pop('data_sent_values'), dtype=np.float64).sum())
+    module_metrics['data_received'] = float(np.frombuffer(module_metrics.pop('data_received_values'), dtype=np.float64).sum())
 
-    if 'http_req_failed' in global_thresholds:
-        for threshold_str in global_thresholds['http_req_failed']:
-            match = re.search(r'rate<([\d.]+)', threshold_str)
-            if match:
-                threshold_value = float(match.group(1))
-                failure_rate = global_failed_requests / global_total_requests if global_total_requests > 0 else 0
-                http_failure_rate_passed = failure_rate < threshold_value
-                http_failure_label = f"HTTP Failure Rate (Goal: < {threshold_value*100:.2f}%)"
-                break
+    # Calculate this module's p95 once, so the threshold check does not have to recompute it
+    durations = module_metrics['http_req_durations']
+    module_metrics['p95'] = _p95(np.frombuffer(durations, dtype=np.float64))
 
-    # Set threshold status strings and colors for the HTML report.
-    http_failure_status = "Passed" if http_failure_rate_passed else "Failed"
-    http_failure_color = "bg-green-100 text-green-800" if http_failure_rate_passed else "bg-red-100 text-red-800"
-    
-    p95_duration_status = "Passed" if p95_duration_threshold_passed else "Failed"
-    p95_duration_color = "bg-green-100 text-green-800" if p95_duration_threshold_passed else "bg-red-100 text-red-800"
+    # Derive the module label from the file name, e.g. 'k6_results_module1.json' -> 'Module1'.
+    stem = os.path.splitext(os.path.basename(results_file))[0]
+    if stem.startswith(_RESULTS_FILE_PREFIX):
+        stem = stem[len(_RESULTS_FILE_PREFIX):]
+    module_name = stem.replace('_', ' ').title()
+    return module_name, module_metrics, file_thresholds
 
-    # --- GENERATE DETAILED TABLE ROWS FOR EACH MODULE ---
-    all_tables_html = ""
-    for module_name, metrics in all_modules_metrics.items():
-        table_rows = ""
-        for group_name, group_data in metrics['group_durations'].items():
-            if "::" not in group_name:
-                continue
-            
-            endpoint_name = group_name.split("::")[-1].strip()
-            avg_time = group_data['final_avg']
-            
-            # Determine status based on failures for this group
-            failed_requests_for_group = metrics['group_failures'][group_name]
-            status = "Failed" if failed_requests_for_group > 0 else "Passed"
-            status_color = "bg-red-100 text-red-800" if status == "Failed" else "bg-green-100 text-green-800"
-            
-            table_rows += f"""
-                        <tr class="hover:{'bg-green-50' if status == 'Passed' else 'bg-red-50'}">
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-900">{endpoint_name}</td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm font-medium">
-                                <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full {status_color}">{status}</span>
-                            </td>
-                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">{avg_time:.2f} ms</td>
-                        </tr>
-            """
-        
-        all_tables_html += f"""
+# --- HTML REPORT TEMPLATES ---
+# The report scaffolding is defined once at module scope and filled in with str.format_map.
+
+_TABLE_TMPL = """
         <h2 class="text-2xl font-bold text-gray-700 mb-4 mt-8">{module_name} Performance</h2>
         <div class="overflow-x-auto">
             <table class="min-w-full bg-white rounded-lg shadow-md overflow-hidden">
@@ -224,8 +285,7 @@ def generate_report(results_files):
         </div>
         """
 
-    # --- BUILD THE FINAL HTML REPORT ---
-    html_content = f"""
+_PAGE_HEAD_TMPL = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -288,16 +348,191 @@ def generate_report(results_files):
         </div>
 
         <!-- Detailed Results Tables based on k6 Modules -->
-        {all_tables_html}
+        """
+
+# Closes the document after the module tables have been written.
+_PAGE_TAIL = """
     </div>
 </body>
 </html>
 """
 
+def _render_table_rows(metrics):
+    """
+    Renders the HTML table rows for one module's endpoint groups.
+
+    Args:
+        metrics (dict): The aggregated metrics of a single module.
+
+    Returns:
+        str: The concatenated <tr> rows for the module's table.
+    """
+    row_parts = []
+    for group_name, avg_time in metrics['group_avgs'].items():
+        if "::" not in group_name:
+            continue
+        
+        endpoint_name = group_name.split("::")[-1].strip()
+        
+        # Determine status based on failures for this group
+        failed_requests_for_group = metrics['group_failures'][group_name]
+        status = "Failed" if failed_requests_for_group > 0 else "Passed"
+        status_color = "bg-red-100 text-red-800" if status == "Failed" else "bg-green-100 text-green-800"
+        
+        row_parts.append(f"""
+                        <tr class="hover:{'bg-green-50' if status == 'Passed' else 'bg-red-50'}">
+                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-900">{endpoint_name}</td>
+                            <td class="px-6 py-4 whitespace-nowrap text-sm font-medium">
+                                <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full {status_color}">{status}</span>
+                            </td>
+                            <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">{avg_time:.2f} ms</td>
+                        </tr>
+            """)
+    return "".join(row_parts)
+
+def generate_report(results_files):
+    """
+    Reads multiple streaming k6 JSON files, aggregates metrics for each module,
+    and generates a single, comprehensive HTML report.
+
+    Args:
+        results_files (list): A list of paths to the k6 JSON output files.
+    """
+    
+    # Check if the list of files is empty.
+    if not results_files:
+        print("Error: No result files were provided.")
+        sys.exit(1)
+
+    # Dictionary to hold the aggregated metrics for all modules
+    all_modules_metrics = {}
+
+    # Global counters for overall summary
+    global_total_requests = 0
+    global_failed_requests = 0
+    global_max_vus = 0
+    global_data_sent = 0
+    global_data_received = 0
+    global_duration_parts = []
+    global_thresholds = {}
+    
+    # Flag to track if any module fails the p95 threshold check
+    p95_duration_threshold_passed = True
+
+    existing_files = []
+    for results_file in results_files:
+        if not os.path.exists(results_file):
+            print(f"Error: The file '{results_file}' was not found. Skipping this file.")
+            continue
+        existing_files.append(results_file)
+
+    # Each file is independent, so parse them in parallel worker processes when there is more than one.
+    if len(existing_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(existing_files), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(_process_one, existing_files))
+    else:
+        results = [_process_one(results_file) for results_file in existing_files]
+
+    for result in results:
+        if result is None:
+            continue
+        module_name, module_metrics, file_thresholds = result
+
+        # Add the module's metrics to the main dictionary
+        all_modules_metrics[module_name] = module_metrics
+        global_thresholds.update(file_thresholds)
+
+        # Update global totals for the summary section
+        global_total_requests += module_metrics['http_reqs']
+        global_failed_requests += module_metrics['http_req_failed']
+        global_max_vus = max(global_max_vus, module_metrics['max_vus'])
+        global_data_sent += module_metrics['data_sent']
+        global_data_received += module_metrics['data_received']
+        global_duration_parts.append(np.frombuffer(module_metrics['http_req_durations'], dtype=np.float64))
+
+    # --- CALCULATE GLOBAL SUMMARY STATISTICS ---
+    global_passed_requests = global_total_requests - global_failed_requests
+    data_sent_mb = global_data_sent / (1024 * 1024)
+    data_received_mb = global_data_received / (1024 * 1024)
+
+    # Join every file's duration buffer in a single allocation for the global statistics.
+    global_durations = np.concatenate(global_duration_parts) if global_duration_parts else np.empty(0)
+
+    if global_durations.size:
+        avg_response_time = np.mean(global_durations)
+    else:
+        avg_response_time = 0
+    
+    # --- CHECK THRESHOLDS AND GENERATE DYNAMIC LABELS ---
+    http_failure_rate_passed = False
+    http_failure_label = "HTTP Failure Rate (No threshold defined)"
+    p95_duration_label = "95th Percentile Duration (No threshold defined)"
+    p95_threshold_value = None
+
+    # Find the p95 threshold value
+    if 'http_req_duration' in global_thresholds:
+        for threshold_str in global_thresholds['http_req_duration']:
+            match = _P95_RE.search(threshold_str)
+            if match:
+                p95_threshold_value = float(match.group(1))
+                p95_duration_label = f"95th Percentile Duration (Goal: < {p95_threshold_value}ms)"
+                break
+    
+    # Check the p95 duration threshold against each module's results
+    if p95_threshold_value is not None:
+        # Loop through each module's metrics and check its p95
+        for module_name, metrics in all_modules_metrics.items():
+            if metrics['http_req_durations']:
+                if metrics['p95'] > p95_threshold_value:
+                    p95_duration_threshold_passed = False
+                    break # A single failure is enough to fail the overall check
+            else:
+                p95_duration_threshold_passed = False # No requests means a failure in some sense
+    else:
+        p95_duration_threshold_passed = True # No threshold defined, so it technically "passes"
+
+    if 'http_req_failed' in global_thresholds:
+        for threshold_str in global_thresholds['http_req_failed']:
+            match = _RATE_RE.search(threshold_str)
+            if match:
+                threshold_value = float(match.group(1))
+                failure_rate = global_failed_requests / global_total_requests if global_total_requests > 0 else 0
+                http_failure_rate_passed = failure_rate < threshold_value
+                http_failure_label = f"HTTP Failure Rate (Goal: < {threshold_value*100:.2f}%)"
+                break
+
+    # Set threshold status strings and colors for the HTML report.
+    http_failure_status = "Passed" if http_failure_rate_passed else "Failed"
+    http_failure_color = "bg-green-100 text-green-800" if http_failure_rate_passed else "bg-red-100 text-red-800"
+    
+    p95_duration_status = "Passed" if p95_duration_threshold_passed else "Failed"
+    p95_duration_color = "bg-green-100 text-green-800" if p95_duration_threshold_passed else "bg-red-100 text-red-800"
+
+    # --- BUILD THE REPORT CONTEXT ---
+    report_context = {
+        'global_total_requests': global_total_requests,
+        'global_passed_requests': global_passed_requests,
+        'global_failed_requests': global_failed_requests,
+        'avg_response_time': avg_response_time,
+        'global_max_vus': global_max_vus,
+        'data_sent_mb': data_sent_mb,
+        'data_received_mb': data_received_mb,
+        'http_failure_color': http_failure_color,
+        'http_failure_label': http_failure_label,
+        'http_failure_status': http_failure_status,
+        'p95_duration_color': p95_duration_color,
+        'p95_duration_label': p95_duration_label,
+        'p95_duration_status': p95_duration_status,
+    }
+
     # --- WRITE THE HTML FILE ---
+    # Sections are written straight into a buffered file, so the full document is never held in memory.
     try:
-        with open("report.html", "w") as file:
-            file.write(html_content)
+        with open("report.html", "w", buffering=1 << 20) as file:
+            file.write(_PAGE_HEAD_TMPL.format_map(report_context))
+            for module_name, metrics in all_modules_metrics.items():
+                file.write(_TABLE_TMPL.format_map({'module_name': module_name, 'table_rows': _render_table_rows(metrics)}))
+            file.write(_PAGE_TAIL)
         print("Report successfully generated to report.html")
     except IOError as e:
         print(f"Error writing file: {e}")